@@ -1,11 +1,67 @@
-from flask import Flask, request, jsonify, session
+from flask import Flask, request, jsonify, session, g
+from werkzeug.middleware.proxy_fix import ProxyFix
 from datetime import datetime, timedelta
 from functools import wraps
+from bisect import bisect_left, bisect_right
+from collections import deque
+import atexit
+import itertools
+import math
+import os
 import secrets
+import threading
+
+from ratelimit import RateLimiter, ConcurrencyLimiter
+from store import PartitionedEventStore
+from json_provider import FastJSONProvider, RawList
+from tasks import TaskQueue
+from compression import (
+    COMPRESSIBLE_MIMETYPES, CompressionCache, gzip_compress, load_static_assets
+)
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = secrets.token_hex(16)
 app.config['JSON_AS_ASCII'] = False  # 支持中文
+app.config['EVENT_PARTITION_KEY'] = 'category'  # 活动存储的分区字段
+app.json = FastJSONProvider(app)  # 优先使用 orjson 编码
+
+# 限流配置：{endpoint: (每秒补充令牌数, 桶容量)}，按 用户/IP 分别计数
+app.config['RATELIMIT_ENABLED'] = True
+app.config['RATE_LIMITS'] = {
+    'register': (2, 20),
+    'login': (5, 30),
+    'get_events': (20, 60),
+    'get_event_detail': (20, 60),
+    'get_interested_users': (20, 60),
+    'create_event': (1, 10),
+    'toggle_interest': (5, 30),
+    'get_my_events': (10, 30),
+}
+app.config['RATELIMIT_MAX_KEYS'] = 100000  # 最多跟踪的令牌桶数量，超出按LRU淘汰
+# 全局并发限制：同时处理的请求数、排队数、排队最长等待秒数
+# 排队的请求也占用服务器线程，所以这两个值必须小于线程池大小才会生效，
+# server.py 启动时会通过 configure_concurrency() 按线程数重新设置
+app.config['MAX_CONCURRENT_REQUESTS'] = 64
+app.config['MAX_QUEUED_REQUESTS'] = 128
+app.config['QUEUE_TIMEOUT'] = 0.05
+# 前面可信反向代理的层数，>0 时按 X-Forwarded-For 识别客户端IP，见 apply_proxy_fix()
+app.config['TRUSTED_PROXIES'] = 0
+
+# 响应压缩：超过阈值（字节）的响应使用gzip，可缓存响应的压缩结果按LRU缓存
+app.config['COMPRESS_MIN_SIZE'] = 1024
+app.config['COMPRESS_LEVEL'] = 6
+app.config['COMPRESS_CACHE_SIZE'] = 256
+# 前端静态资源：带 ?v=<hash> 指纹的请求长期缓存，其余请求短期缓存
+app.config['STATIC_DIR'] = os.path.dirname(os.path.abspath(__file__))
+app.config['STATIC_FILES'] = ['index.html', 'profile.html', 'publish.html', 'app.js', 'style.css']
+app.config['STATIC_MAX_AGE'] = 365 * 24 * 3600
+app.config['STATIC_REVALIDATE_AGE'] = 300
+
+# 后台任务队列：工作线程数、队列容量、每批最多执行的任务数
+app.config['TASK_WORKERS'] = 2
+app.config['TASK_QUEUE_SIZE'] = 10000
+app.config['TASK_BATCH_SIZE'] = 64
+app.config['CHANGE_FEED_SIZE'] = 1000  # 变更流保留的最近条数
 
 # ===========================
 # 内存数据存储
@@ -16,15 +72,54 @@ users_db = {}
 user_id_counter = 1
 
 # 活动数据 {event_id: {title, start_time, end_time, location, ...}}
-events_db = {}
+# 按分区字段分片存储，每个分片独立加锁并维护按开始时间排序的索引
+events_db = PartitionedEventStore(app.config['EVENT_PARTITION_KEY'])
 event_id_counter = 1
 
 # "想去"关系 {event_id: [user_id1, user_id2, ...]}
 interests_db = {}
 
+# "想去"加入顺序索引，用于键集分页
+# {event_id: [join_seq1, join_seq2, ...]}，与 interests_db 中的列表一一对应，单调递增
+interest_seqs_db = {}
+# {event_id: {user_id: join_seq}}，用户最近一次加入的序号（取消后保留，旧游标仍然有效）
+interest_join_seq = {}
+interest_seq_counter = itertools.count(1)
+
+# 活动JSON片段缓存 {event_id: (event, interested_count, head, tail)}
+# head + b'true'/b'false' + tail 即为 format_event 的编码结果
+event_fragments = {}
+
+# 变更流 [{seq, type, event_id, user_id, created_at}, ...]，只保留最近的记录
+# 序号在请求线程中与数据修改一起分配，条目经后台队列批量写入
+change_feed = deque(maxlen=app.config['CHANGE_FEED_SIZE'])
+change_seq = itertools.count(1)
+change_feed_lock = threading.Lock()
+# 多个工作线程可能乱序送达，先到的后续序号在此等待，只追加连续的部分
+pending_changes = {}
+next_change_seq = 1
+
+# 通知 {user_id: [{type, event_id, message, created_at}, ...]}
+notifications_db = {}
+# 已发送过"名额已满"通知的活动，避免在满员边界反复切换时重复通知
+full_notified_events = set()
+
+# 想去用户分页参数
+INTERESTED_PAGE_SIZE = 20
+INTERESTED_PAGE_MAX = 100
+
+# 写操作锁（多线程部署时保护自增计数器），"想去"关系由活动所在分片的锁保护
+write_lock = threading.RLock()
+
+# 就绪标志：warmup() 完成后置位，/readyz 据此返回
+app_ready = threading.Event()
+
 # 活动分类
 CATEGORIES = ['学术讲座', '社团招新', '文体娱乐', '其他']
 
+# 人数上限的最大值
+MAX_CAPACITY = 100000
+
 
 # ===========================
 # 工具函数
@@ -67,6 +162,77 @@ def parse_datetime(dt_str):
     raise ValueError('时间格式错误，支持格式如: 2025-11-15 14:30')
 
 
+def get_usernames(user_ids):
+    """批量解析用户名，返回 {user_id: username}，忽略已不存在的用户"""
+    return {uid: users_db[uid]['username'] for uid in user_ids if uid in users_db}
+
+
+def add_interest(event_id, user_id):
+    """添加"想去"关系，同时维护加入顺序索引"""
+    seq = next(interest_seq_counter)
+
+    interests_db.setdefault(event_id, []).append(user_id)
+    interest_seqs_db.setdefault(event_id, []).append(seq)
+    interest_join_seq.setdefault(event_id, {})[user_id] = seq
+
+
+def remove_interest(event_id, user_id):
+    """取消"想去"关系，通过加入序号二分定位"""
+    seqs = interest_seqs_db[event_id]
+    idx = bisect_left(seqs, interest_join_seq[event_id][user_id])
+    del interests_db[event_id][idx]
+    del seqs[idx]
+
+
+def rebuild_interest_index():
+    """根据 interests_db 重建加入顺序索引（直接写入 interests_db 后调用）"""
+    interest_seqs_db.clear()
+    interest_join_seq.clear()
+    for event_id, user_ids in interests_db.items():
+        seqs = [next(interest_seq_counter) for _ in user_ids]
+        interest_seqs_db[event_id] = seqs
+        interest_join_seq[event_id] = dict(zip(user_ids, seqs))
+
+
+def parse_interest_cursor(event_id, cursor):
+    """
+    解析分页游标，返回加入序号
+    标准格式为 "<user_id>:<join_seq>"（即 next_cursor），序号固定不变；
+    也接受单独的 user_id，此时取该用户最近一次加入的序号
+    """
+    user_id, sep, seq = cursor.partition(':')
+    try:
+        if sep:
+            return int(seq)
+        seq = interest_join_seq.get(event_id, {}).get(int(user_id))
+    except ValueError:
+        seq = None
+    if seq is None:
+        raise ValueError('无效的分页游标')
+    return seq
+
+
+def get_interested_page(event_id, after_seq=None, limit=INTERESTED_PAGE_SIZE):
+    """
+    按加入顺序分页获取"想去"用户（键集分页）
+    after_seq 为上一页最后一个用户的加入序号，返回 (users, next_cursor)，没有下一页时 next_cursor 为 None
+    """
+    with events_db.lock_for(event_id):
+        user_ids = interests_db.get(event_id, [])
+        seqs = interest_seqs_db.get(event_id, [])
+        start = bisect_right(seqs, after_seq) if after_seq is not None else 0
+        page_ids = user_ids[start:start + limit]
+        end = start + len(page_ids)
+        next_cursor = f'{user_ids[end - 1]}:{seqs[end - 1]}' if page_ids and end < len(user_ids) else None
+
+    usernames = get_usernames(page_ids)
+    users = [
+        {'user_id': uid, 'username': usernames[uid]}
+        for uid in page_ids if uid in usernames
+    ]
+    return users, next_cursor
+
+
 def format_event(event_id):
     """格式化活动信息，添加统计数据"""
     event = events_db[event_id].copy()
@@ -91,6 +257,258 @@ def format_event(event_id):
     return event
 
 
+# ===========================
+# 限流与准入控制
+# ===========================
+
+rate_limiter = RateLimiter(max_keys=app.config['RATELIMIT_MAX_KEYS'])
+concurrency_limiter = ConcurrencyLimiter(
+    app.config['MAX_CONCURRENT_REQUESTS'],
+    app.config['MAX_QUEUED_REQUESTS'],
+    app.config['QUEUE_TIMEOUT']
+)
+
+# 不参与限流的接口（探针和限流统计本身）
+RATELIMIT_EXEMPT = {'healthz', 'readyz', 'get_limit_stats'}
+
+# warmup() 发出的内部请求带此 environ 标记，不参与限流和计数
+WARMUP_ENVIRON_KEY = 'backend.warmup'
+
+# 未经 ProxyFix 包装的原始 WSGI 应用
+_raw_wsgi_app = app.wsgi_app
+
+
+def apply_proxy_fix(trusted_proxies):
+    """
+    部署在反向代理之后时，按 X-Forwarded-For 取真实客户端IP，
+    否则所有匿名用户共用代理IP的限流桶。只应信任实际存在的代理层数，
+    多信任一层客户端就能伪造IP绕过限流
+    """
+    app.config['TRUSTED_PROXIES'] = trusted_proxies
+    if trusted_proxies > 0:
+        app.wsgi_app = ProxyFix(_raw_wsgi_app, x_for=trusted_proxies,
+                                x_proto=trusted_proxies, x_host=trusted_proxies)
+    else:
+        app.wsgi_app = _raw_wsgi_app
+
+
+def configure_concurrency(threads):
+    """
+    按服务器线程数设置并发限制：留出约1/4的线程不处理业务，
+    它们只负责短暂排队和快速返回503，避免请求堆积在服务器的线程池队列里
+    """
+    reserve = max(1, threads // 4)
+    max_concurrent = max(1, threads - reserve)
+    max_queue = threads - max_concurrent
+    app.config['MAX_CONCURRENT_REQUESTS'] = max_concurrent
+    app.config['MAX_QUEUED_REQUESTS'] = max_queue
+    concurrency_limiter.configure(max_concurrent, max_queue)
+
+
+@app.before_request
+def admission_control():
+    """按路由和用户/IP限流，再申请全局并发名额"""
+    if (not app.config['RATELIMIT_ENABLED'] or request.endpoint in RATELIMIT_EXEMPT
+            or request.environ.get(WARMUP_ENVIRON_KEY)):
+        return None
+    
+    limit = app.config['RATE_LIMITS'].get(request.endpoint)
+    if limit:
+        user_id = session.get('user_id')
+        client = f'user:{user_id}' if user_id else f'ip:{request.remote_addr}'
+        allowed, retry_after = rate_limiter.allow((request.endpoint, client), *limit)
+        if not allowed:
+            response, code = error_response('请求过于频繁，请稍后再试', 429)
+            response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+            return response, code
+    
+    if not concurrency_limiter.acquire():
+        response, code = error_response('服务繁忙，请稍后再试', 503)
+        response.headers['Retry-After'] = '1'
+        return response, code
+    g.admitted = True
+    return None
+
+
+@app.teardown_request
+def release_admission(exc=None):
+    """请求结束后归还并发名额"""
+    if g.pop('admitted', False):
+        concurrency_limiter.release()
+
+
+@app.route('/api/stats/limits', methods=['GET'])
+def get_limit_stats():
+    """
+    获取限流与并发控制计数
+    GET /api/stats/limits
+    """
+    return success_response({
+        'rate_limit': rate_limiter.stats(),
+        'concurrency': concurrency_limiter.stats()
+    })
+
+
+# ===========================
+# 响应压缩与静态资源
+# ===========================
+
+compression_cache = CompressionCache(app.config['COMPRESS_CACHE_SIZE'])
+
+# 启动时读取并预压缩前端文件 {filename: StaticAsset}
+static_assets = load_static_assets(
+    app.config['STATIC_DIR'], app.config['STATIC_FILES'], app.config['COMPRESS_LEVEL']
+)
+
+
+@app.after_request
+def compress_response(response):
+    """客户端支持gzip且响应体超过阈值时压缩，可缓存的GET响应复用压缩结果"""
+    if (response.status_code != 200 or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    if 'gzip' not in request.accept_encodings:
+        return response
+    
+    data = response.get_data()
+    if len(data) < app.config['COMPRESS_MIN_SIZE']:
+        return response
+    
+    level = app.config['COMPRESS_LEVEL']
+    cacheable = (request.method == 'GET' and not response.cache_control.no_store
+                 and not response.cache_control.private)
+    if cacheable:
+        compressed = compression_cache.get_or_compress(data, level)
+    else:
+        compressed = gzip_compress(data, level)
+    
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+
+def static_asset(filename):
+    """
+    前端静态资源
+    GET /index.html, /app.js?v=<hash> ...
+    """
+    asset = static_assets[filename]
+    use_gzip = 'gzip' in request.accept_encodings
+    response = app.response_class(asset.gzip_body if use_gzip else asset.body,
+                                  mimetype=asset.mimetype)
+    if use_gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+        response.set_etag(asset.etag + '-gzip')
+    else:
+        response.set_etag(asset.etag)
+    response.vary.add('Accept-Encoding')
+    
+    # HTML每次协商，带匹配指纹的资源长期缓存
+    if asset.is_html:
+        response.cache_control.no_cache = True
+    elif request.args.get('v') == asset.etag:
+        response.cache_control.public = True
+        response.cache_control.max_age = app.config['STATIC_MAX_AGE']
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.public = True
+        response.cache_control.max_age = app.config['STATIC_REVALIDATE_AGE']
+    
+    return response.make_conditional(request)
+
+
+# 只为配置的前端文件注册路由，其他路径保持Flask默认的404/405行为
+for _filename in static_assets:
+    app.add_url_rule(f'/{_filename}', 'static_asset', static_asset,
+                     defaults={'filename': _filename}, methods=['GET'])
+
+
+def format_event_json(event_id):
+    """
+    format_event 的JSON字节版本，用于拼装列表响应
+    除 is_interested 外的部分按活动缓存，活动被替换或想去人数变化时重新编码
+    """
+    event = events_db[event_id]
+    interested_users = interests_db.get(event_id, [])
+    
+    cached = event_fragments.get(event_id)
+    if cached is None or cached[0] is not event or cached[1] != len(interested_users):
+        data = format_event(event_id)
+        data['is_interested'] = False
+        # 只有键名处的 "is_interested" 前后是未转义的引号，可以安全切分
+        head, _, tail = app.json.dumps_bytes(data).partition(b'"is_interested":false')
+        cached = (event, data['interested_count'], head + b'"is_interested":', tail)
+        event_fragments[event_id] = cached
+    
+    user_id = session.get('user_id')
+    is_interested = user_id is not None and user_id in interested_users
+    return cached[2] + (b'true' if is_interested else b'false') + cached[3]
+
+
+# ===========================
+# 后台任务（非关键副作用）
+# ===========================
+
+task_queue = TaskQueue(
+    app.config['TASK_WORKERS'],
+    app.config['TASK_QUEUE_SIZE'],
+    app.config['TASK_BATCH_SIZE']
+)
+atexit.register(task_queue.shutdown)
+
+
+def make_change(change_type, event_id, user_id):
+    """
+    生成一条变更记录，需在请求线程中与数据修改一起调用（在同一把锁内），
+    保证序号顺序与实际修改顺序一致；生成后必须经 apply_changes 写入
+    """
+    return {
+        'seq': next(change_seq),
+        'type': change_type,
+        'event_id': event_id,
+        'user_id': user_id,
+        'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+
+def apply_changes(entries):
+    """后台批量写入变更记录，按序号连续追加"""
+    global next_change_seq
+    with change_feed_lock:
+        for entry in entries:
+            pending_changes[entry['seq']] = entry
+        ready = []
+        while next_change_seq in pending_changes:
+            ready.append(pending_changes.pop(next_change_seq))
+            next_change_seq += 1
+        change_feed.extend(ready)
+
+
+def notify_event_full(event_id):
+    """活动名额已满时通知创建者"""
+    event = events_db.get(event_id)
+    if event is None or not event.get('creator_id'):
+        return
+    notifications_db.setdefault(event['creator_id'], []).append({
+        'type': 'event_full',
+        'event_id': event_id,
+        'message': f'你发布的活动「{event["title"]}」名额已满',
+        'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    })
+
+
+@app.route('/api/stats/tasks', methods=['GET'])
+def get_task_stats():
+    """
+    获取后台任务队列计数
+    GET /api/stats/tasks
+    """
+    return success_response(task_queue.stats())
+
+
 # ===========================
 # 用户相关API
 # ===========================
@@ -118,20 +536,21 @@ def register():
     if len(password) < 6:
         return error_response('密码长度不能少于6位')
     
-    # 检查用户名是否已存在
-    for user in users_db.values():
-        if user['username'] == username:
-            return error_response('用户名已存在')
-    
-    # 创建新用户
-    user_id = user_id_counter
-    user_id_counter += 1
-    
-    users_db[user_id] = {
-        'username': username,
-        'password': password,  # 实际项目应该加密，这里简化
-        'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    }
+    with write_lock:
+        # 检查用户名是否已存在
+        for user in users_db.values():
+            if user['username'] == username:
+                return error_response('用户名已存在')
+        
+        # 创建新用户
+        user_id = user_id_counter
+        user_id_counter += 1
+        
+        users_db[user_id] = {
+            'username': username,
+            'password': password,  # 实际项目应该加密，这里简化
+            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
     
     return success_response({'user_id': user_id, 'username': username}, '注册成功')
 
@@ -151,7 +570,8 @@ def login():
     password = data.get('password', '')
     
     # 查找用户
-    for user_id, user in users_db.items():
+    # 遍历快照，避免与并发注册冲突
+    for user_id, user in list(users_db.items()):
         if user['username'] == username and user['password'] == password:
             # 设置会话
             session['user_id'] = user_id
@@ -206,11 +626,16 @@ def get_events():
     status = request.args.get('status', 'upcoming')
     
     now = datetime.now()
-    result = []
+    result = RawList()
     
-    for event_id in events_db:
-        event = events_db[event_id]
-        
+    # 按开始时间有序遍历；按分类分区时分类筛选只访问一个分片
+    reverse = status == 'past'
+    if category and events_db.partition_field == 'category':
+        candidates = events_db.query(category, reverse=reverse)
+    else:
+        candidates = events_db.query(reverse=reverse)
+    
+    for event_id, event in candidates:
         # 状态筛选
         if status == 'upcoming' and event['end_time'] < now:
             continue
@@ -221,10 +646,7 @@ def get_events():
         if category and event.get('category') != category:
             continue
         
-        result.append(format_event(event_id))
-    
-    # 按开始时间排序
-    result.sort(key=lambda x: x['start_time'], reverse=(status == 'past'))
+        result.append(format_event_json(event_id))
     
     return success_response({
         'events': result,
@@ -251,16 +673,46 @@ def get_event_detail(event_id):
             'username': users_db[creator_id]['username']
         }
     
-    # 添加想去的用户列表（前10个）
-    interested_user_ids = interests_db.get(event_id, [])[:10]
-    event['interested_users'] = [
-        {'user_id': uid, 'username': users_db[uid]['username']}
-        for uid in interested_user_ids if uid in users_db
-    ]
+    # 添加想去的用户列表（前10个，完整列表见 /interested 分页接口）
+    event['interested_users'], _ = get_interested_page(event_id, limit=10)
     
     return success_response(event)
 
 
+@app.route('/api/events/<int:event_id>/interested', methods=['GET'])
+def get_interested_users(event_id):
+    """
+    分页获取想去的用户列表（按加入顺序）
+    GET /api/events/1/interested?after=5:12&limit=20
+    
+    参数:
+    - after: 上一页返回的 next_cursor（可选，不传则从头开始）；也可以传单独的user_id
+    - limit: 每页数量，默认20，最大100
+    """
+    if event_id not in events_db:
+        return error_response('活动不存在', 404)
+    
+    try:
+        limit = int(request.args.get('limit', INTERESTED_PAGE_SIZE))
+    except ValueError:
+        return error_response('分页参数必须为整数')
+    limit = max(1, min(limit, INTERESTED_PAGE_MAX))
+    
+    after = request.args.get('after')
+    try:
+        after_seq = parse_interest_cursor(event_id, after) if after is not None else None
+    except ValueError as e:
+        return error_response(str(e))
+    
+    users, next_cursor = get_interested_page(event_id, after_seq, limit)
+    return success_response({
+        'users': users,
+        'total': len(interests_db.get(event_id, [])),
+        'has_more': next_cursor is not None,
+        'next_cursor': next_cursor
+    })
+
+
 @app.route('/api/events', methods=['POST'])
 @login_required
 def create_event():
@@ -315,13 +767,24 @@ def create_event():
             capacity = int(capacity)
             if capacity < 1:
                 return error_response('人数上限必须大于0')
+            if capacity > MAX_CAPACITY:
+                return error_response(f'人数上限不能超过{MAX_CAPACITY}')
         except ValueError:
             return error_response('人数上限必须为整数')
     
-    # 创建活动
-    event_id = event_id_counter
-    event_id_counter += 1
+    # 分配活动ID
+    with write_lock:
+        event_id = event_id_counter
+        event_id_counter += 1
     
+    # 初始化"想去"列表
+    interests_db[event_id] = []
+    interest_seqs_db[event_id] = []
+    
+    # 变更序号在活动可见之前分配，保证排在该活动后续的想去变更之前
+    change = make_change('event_created', event_id, user_id)
+    
+    # 创建活动（只锁所在分片）
     events_db[event_id] = {
         'title': data['title'].strip(),
         'start_time': start_time,
@@ -335,8 +798,7 @@ def create_event():
         'created_at': datetime.now()
     }
     
-    # 初始化"想去"列表
-    interests_db[event_id] = []
+    task_queue.submit_batched(apply_changes, change)
     
     return success_response(format_event(event_id), '活动创建成功')
 
@@ -362,31 +824,44 @@ def toggle_interest(event_id):
     if event['end_time'] < datetime.now():
         return error_response('活动已结束，无法操作')
     
-    # 获取想去列表
-    if event_id not in interests_db:
-        interests_db[event_id] = []
-    
-    interested_users = interests_db[event_id]
-    
-    # 已经想去 -> 取消
-    if user_id in interested_users:
-        interested_users.remove(user_id)
-        return success_response({
-            'is_interested': False,
-            'interested_count': len(interested_users)
-        }, '已取消"想去"')
+    # 变更序号在分片锁内分配，后台任务在释放锁之后再提交，
+    # 避免队列背压时阻塞同分区的其他写入
+    notify_full = False
+    with events_db.lock_for(event_id):
+        # 获取想去列表
+        interested_users = interests_db.get(event_id, [])
+        is_interested = user_id not in interested_users
+        
+        if is_interested:
+            # 检查是否已满
+            capacity = event.get('capacity')
+            if capacity is not None and len(interested_users) >= capacity:
+                return error_response('活动名额已满')
+            
+            # 添加想去
+            add_interest(event_id, user_id)
+            change = make_change('interest_added', event_id, user_id)
+            
+            # 第一次满员时通知创建者
+            if (capacity is not None and len(interests_db[event_id]) == capacity
+                    and event_id not in full_notified_events):
+                full_notified_events.add(event_id)
+                notify_full = True
+        else:
+            # 已经想去 -> 取消
+            remove_interest(event_id, user_id)
+            change = make_change('interest_removed', event_id, user_id)
+        
+        interested_count = len(interests_db[event_id])
     
-    # 检查是否已满
-    capacity = event.get('capacity')
-    if capacity is not None and len(interested_users) >= capacity:
-        return error_response('活动名额已满')
+    task_queue.submit_batched(apply_changes, change)
+    if notify_full:
+        task_queue.submit(notify_event_full, event_id)
     
-    # 添加想去
-    interested_users.append(user_id)
     return success_response({
-        'is_interested': True,
-        'interested_count': len(interested_users)
-    }, '已标记"想去"')
+        'is_interested': is_interested,
+        'interested_count': interested_count
+    }, '已标记"想去"' if is_interested else '已取消"想去"')
 
 
 @app.route('/api/my/events', methods=['GET'])
@@ -403,31 +878,68 @@ def get_my_events():
     user_id = session.get('user_id')
     
     # 我创建的活动
-    created = []
-    for event_id, event in events_db.items():
-        if event.get('creator_id') == user_id:
-            created.append(format_event(event_id))
+    created = [
+        event_id for event_id, event in events_db.items()
+        if event.get('creator_id') == user_id
+    ]
     
     # 我想去的活动
-    interested = []
-    for event_id, interested_users in interests_db.items():
-        if user_id in interested_users:
-            interested.append(format_event(event_id))
+    interested = [
+        event_id for event_id, interested_users in list(interests_db.items())
+        if user_id in interested_users
+    ]
     
     # 排序
-    created.sort(key=lambda x: x['start_time'], reverse=True)
-    interested.sort(key=lambda x: x['start_time'])
+    created.sort(key=lambda eid: events_db[eid]['start_time'], reverse=True)
+    interested.sort(key=lambda eid: events_db[eid]['start_time'])
     
     return success_response({
-        'created': created,
-        'interested': interested
+        'created': RawList(format_event_json(eid) for eid in created),
+        'interested': RawList(format_event_json(eid) for eid in interested)
     })
 
 
+@app.route('/api/my/notifications', methods=['GET'])
+@login_required
+def get_my_notifications():
+    """
+    获取我的通知（如发布的活动名额已满）
+    GET /api/my/notifications
+    """
+    user_id = session.get('user_id')
+    notifications = list(reversed(notifications_db.get(user_id, [])))
+    return success_response({'notifications': notifications})
+
+
 # ===========================
 # 其他API
 # ===========================
 
+@app.route('/api/changes', methods=['GET'])
+def get_changes():
+    """
+    获取变更流
+    GET /api/changes?after=10&limit=100
+    
+    参数:
+    - after: 只返回序号大于该值的变更（可选）
+    - limit: 最多返回条数，默认100
+    """
+    try:
+        after = int(request.args.get('after', 0))
+        limit = max(1, min(int(request.args.get('limit', 100)), 1000))
+    except ValueError:
+        return error_response('分页参数必须为整数')
+    
+    with change_feed_lock:
+        changes = [c for c in change_feed if c['seq'] > after][:limit]
+    
+    return success_response({
+        'changes': changes,
+        'last_seq': changes[-1]['seq'] if changes else after
+    })
+
+
 @app.route('/api/categories', methods=['GET'])
 def get_categories():
     """
@@ -449,8 +961,9 @@ def get_stats():
     return success_response({
         'total_users': len(users_db),
         'total_events': len(events_db),
+        'events_by_partition': events_db.partitions(),
         'upcoming_events': upcoming_count,
-        'total_interests': sum(len(v) for v in interests_db.values())
+        'total_interests': sum(len(v) for v in list(interests_db.values()))
     })
 
 
@@ -523,12 +1036,56 @@ def init_sample_data():
     interests_db[1] = [2]  # bob想去活动1
     interests_db[2] = []
     interests_db[3] = [1, 2]  # alice和bob都想去活动3
+    rebuild_interest_index()
     
     print('样例数据初始化完成')
     print(f'- 用户数: {len(users_db)}')
     print(f'- 活动数: {len(events_db)}')
 
 
+# ===========================
+# 预热与健康检查
+# ===========================
+
+def warmup():
+    """
+    预热：在接收流量前构建活动JSON片段缓存并走一遍热点接口，
+    生产环境由 server.py 在 fork worker 之前调用（写时复制共享内存）
+    索引由写操作增量维护，这里不重建，以免已发出的分页游标失效
+    """
+    # 为所有活动生成JSON片段（匿名请求上下文，is_interested 在每次请求时拼接）
+    with app.test_request_context():
+        for event_id in events_db:
+            format_event_json(event_id)
+    
+    # 预先走一遍只读接口，触发路由匹配、JSON序列化等首次调用开销（不计入限流）
+    with app.test_client() as client:
+        for path in ('/api/events', '/api/events?status=all', '/api/categories', '/api/stats'):
+            client.get(path, environ_base={WARMUP_ENVIRON_KEY: True})
+    
+    app_ready.set()
+
+
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    """
+    存活探针：进程能处理请求即返回200
+    GET /healthz
+    """
+    return success_response({'status': 'ok'})
+
+
+@app.route('/readyz', methods=['GET'])
+def readyz():
+    """
+    就绪探针：预热完成前返回503
+    GET /readyz
+    """
+    if not app_ready.is_set():
+        return error_response('服务预热中', 503)
+    return success_response({'status': 'ready'})
+
+
 # ===========================
 # 启动服务
 # ===========================
@@ -548,9 +1105,17 @@ def index():
             'GET /api/events/<id>': '获取活动详情',
             'POST /api/events': '创建活动',
             'POST /api/events/<id>/interest': '标记/取消想去',
+            'GET /api/events/<id>/interested': '分页获取想去用户',
             'GET /api/my/events': '获取我的活动',
+            'GET /api/my/notifications': '获取我的通知',
+            'GET /api/changes': '获取变更流',
             'GET /api/categories': '获取分类列表',
-            'GET /api/stats': '获取统计信息'
+            'GET /api/stats': '获取统计信息',
+            'GET /api/stats/limits': '获取限流统计',
+            'GET /api/stats/tasks': '获取后台任务统计',
+            'GET /<file>': '前端静态资源',
+            'GET /healthz': '存活探针',
+            'GET /readyz': '就绪探针'
         }
     })
 
@@ -0,0 +1,73 @@
+"""
+JSON 序列化基准：活动列表响应
+
+对比两种方式编码 N 个活动的列表响应：
+- baseline: format_event 生成字典，经标准库 JSON provider 的 success_response 编码
+- fast: 缓存的活动JSON片段 + RawList 拼接（FastJSONProvider）
+
+用法: python bench_json.py [活动数量] [重复次数]
+"""
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+from flask.json.provider import DefaultJSONProvider
+
+import backend
+from backend import app, events_db, interests_db, format_event, format_event_json, success_response
+from json_provider import RawList
+
+
+def populate(count):
+    now = datetime.now()
+    for event_id in range(1, count + 1):
+        events_db[event_id] = {
+            'title': f'活动{event_id}',
+            'start_time': now + timedelta(hours=event_id),
+            'end_time': now + timedelta(hours=event_id + 2),
+            'location': '教学楼A201',
+            'category': backend.CATEGORIES[event_id % len(backend.CATEGORIES)],
+            'description': '邀请知名校友分享AI趋势与职业发展机会。' * 10,
+            'cover_image_url': 'https://picsum.photos/seed/ai/600/300',
+            'capacity': 100,
+            'creator_id': 1,
+            'created_at': now
+        }
+        interests_db[event_id] = list(range(1, event_id % 50 + 1))
+
+
+def baseline(event_ids):
+    events = [format_event(eid) for eid in event_ids]
+    return success_response({'events': events, 'total': len(events)}).get_data()
+
+
+def fast(event_ids):
+    events = RawList(format_event_json(eid) for eid in event_ids)
+    return success_response({'events': events, 'total': len(events)}).get_data()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    populate(count)
+    event_ids = list(events_db)
+
+    fast_provider = app.json
+    stdlib_provider = DefaultJSONProvider(app)
+    stdlib_provider.ensure_ascii = False
+
+    with app.test_request_context():
+        app.json = stdlib_provider
+        baseline_time = min(timeit.repeat(lambda: baseline(event_ids), number=repeat, repeat=3))
+        app.json = fast_provider
+        fast(event_ids)  # 预热片段缓存
+        fast_time = min(timeit.repeat(lambda: fast(event_ids), number=repeat, repeat=3))
+
+    print(f'{count} 个活动，每轮 {repeat} 次')
+    print(f'baseline (format_event + stdlib): {baseline_time / repeat * 1000:.2f} ms/请求')
+    print(f'fast (片段缓存 + FastJSONProvider): {fast_time / repeat * 1000:.2f} ms/请求')
+    print(f'加速比: {baseline_time / fast_time:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""
+响应压缩与前端静态资源
+
+- gzip_compress / CompressionCache: gzip 压缩响应体，按内容摘要缓存压缩结果
+- StaticAsset / load_static_assets: 启动时读取前端文件，计算内容哈希作为 ETag，
+  预先生成 gzip 版本，并给 HTML 中引用的资源加上 ?v=<hash> 指纹
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+from collections import OrderedDict
+
+# 值得压缩的响应类型
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'text/javascript',
+    'text/html',
+    'text/css',
+    'text/plain',
+}
+
+# HTML 中引用本地资源的属性，如 href="style.css"、src="app.js"
+ASSET_REF_PATTERN = re.compile(r'''(href|src)=(["'])([^"'?#]+)\2''')
+
+
+def gzip_compress(data, level=6):
+    """gzip 压缩，mtime 固定为0以保证相同输入得到相同输出"""
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def content_hash(data):
+    """内容哈希，用作 ETag 和资源指纹"""
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+class CompressionCache:
+    """按响应体摘要缓存 gzip 结果，超出容量按 LRU 淘汰"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compress(self, data, level=6):
+        key = hashlib.sha1(data).digest()
+        with self._lock:
+            compressed = self._entries.get(key)
+            if compressed is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return compressed
+            self.misses += 1
+
+        compressed = gzip_compress(data, level)
+        with self._lock:
+            self._entries[key] = compressed
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return compressed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+class StaticAsset:
+    """单个静态资源：原始内容、gzip 版本、ETag 与 MIME 类型"""
+
+    def __init__(self, name, body, level=6):
+        self.name = name
+        self.body = body
+        self.gzip_body = gzip_compress(body, level)
+        self.etag = content_hash(body)
+        self.mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        self.is_html = self.mimetype == 'text/html'
+
+
+def fingerprint_html(html, versions):
+    """把 HTML 中对已知资源的引用改写为 name?v=<hash>"""
+    def replace(match):
+        attr, quote, name = match.groups()
+        if name not in versions:
+            return match.group(0)
+        return f'{attr}={quote}{name}?v={versions[name]}{quote}'
+    return ASSET_REF_PATTERN.sub(replace, html)
+
+
+def load_static_assets(base_dir, filenames, level=6):
+    """
+    读取前端文件并预压缩，返回 {name: StaticAsset}
+    先处理非 HTML 资源，以便 HTML 中的引用能带上它们的指纹
+    """
+    raw = {}
+    for name in filenames:
+        path = os.path.join(base_dir, name)
+        if os.path.isfile(path):
+            with open(path, 'rb') as f:
+                raw[name] = f.read()
+
+    assets = {}
+    for name, body in raw.items():
+        if mimetypes.guess_type(name)[0] != 'text/html':
+            assets[name] = StaticAsset(name, body, level)
+
+    versions = {name: asset.etag for name, asset in assets.items()}
+    for name, body in raw.items():
+        if name not in assets:
+            html = fingerprint_html(body.decode('utf-8'), versions)
+            assets[name] = StaticAsset(name, html.encode('utf-8'), level)
+    return assets
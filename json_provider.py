@@ -0,0 +1,97 @@
+"""
+快速 JSON 序列化
+
+FastJSONProvider 替换 Flask 默认的 JSON provider：安装了 orjson 时用它编码，
+否则退回标准库 json；同样键排序、紧凑格式，并遵循 JSON_AS_ASCII 配置。
+orjson 无法编码的对象（如超过64位的整数）自动退回标准库编码。
+
+与标准库输出的已知差异（仅 orjson 路径）：
+- 非字符串键先转成字符串再排序，如 {10: .., 9: ..} 输出顺序为 "10"、"9"
+- NaN 和 Infinity 编码为 null
+
+RawList 用于拼装列表响应：元素是已经编码好的 JSON 字节片段，
+序列化时直接拼接，不再逐个对象重新编码。
+"""
+import secrets
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时使用标准库
+    orjson = None
+
+# 占位符随机后缀，避免与用户内容中的同名字符串冲突
+RAW_TOKEN_NONCE = secrets.token_hex(8)
+
+
+class RawList(list):
+    """元素为已编码 JSON 字节的列表，序列化时原样拼接"""
+
+
+def replace_raw(value, replace):
+    """把嵌套 dict 中的 RawList 值替换为 replace(raw_list) 的结果"""
+    if isinstance(value, RawList):
+        return replace(value)
+    if isinstance(value, dict):
+        return {key: replace_raw(item, replace) for key, item in value.items()}
+    return value
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """优先使用 orjson 的 JSON provider"""
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.ensure_ascii = app.config.get('JSON_AS_ASCII', True)
+
+    def _use_orjson(self, kwargs=None):
+        # orjson 不支持缩进和转义非ASCII字符，这些情况交给标准库
+        return orjson is not None and not kwargs and not self.ensure_ascii
+
+    def dumps_bytes(self, obj):
+        """编码为紧凑格式的 UTF-8 字节"""
+        if self._use_orjson():
+            option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            try:
+                return orjson.dumps(obj, default=self.default, option=option)
+            except (orjson.JSONEncodeError, TypeError):
+                pass  # orjson 不支持的值交给标准库
+        return super().dumps(obj, separators=(',', ':')).encode('utf-8')
+
+    def dumps(self, obj, **kwargs):
+        if self._use_orjson(kwargs):
+            return self.dumps_bytes(obj).decode('utf-8')
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def dumps_with_raw(self, obj):
+        """编码 obj，其中 dict 里的 RawList 值直接拼接已编码片段"""
+        raw = {}
+
+        def to_token(fragments):
+            # 控制字符在两种编码器中都转义为 \u0000，编码后的占位符形式一致
+            token = f'\x00raw{len(raw)}:{RAW_TOKEN_NONCE}\x00'
+            raw[token] = b'[' + b','.join(fragments) + b']'
+            return token
+
+        encoded = self.dumps_bytes(replace_raw(obj, to_token))
+        for token, fragment in raw.items():
+            encoded = encoded.replace(self.dumps_bytes(token), fragment, 1)
+        return encoded
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if self.compact is False or (self.compact is None and self._app.debug):
+            # 调试模式下带缩进输出，片段需要先解析回对象
+            obj = replace_raw(obj, lambda fragments: [self.loads(f) for f in fragments])
+            return super().response(obj)
+        return self._app.response_class(
+            self.dumps_with_raw(obj) + b'\n', mimetype=self.mimetype
+        )
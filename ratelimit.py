@@ -0,0 +1,160 @@
+"""
+进程内限流与准入控制
+
+- RateLimiter: 分片令牌桶，按 (路由, 用户/IP) 计数，每个分片独立加锁，
+  分片内用 LRU 淘汰最久未访问的桶，内存占用有上限
+- ConcurrencyLimiter: 全局并发上限 + 短等待队列，超出时快速拒绝
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class TokenBucket:
+    """令牌桶：tokens 为当前令牌数，updated 为上次补充时间"""
+    __slots__ = ('tokens', 'updated')
+
+    def __init__(self, tokens, updated):
+        self.tokens = tokens
+        self.updated = updated
+
+
+class RateLimiter:
+    """分片令牌桶限流器"""
+
+    def __init__(self, shards=16, max_keys=10000, clock=time.monotonic):
+        self.clock = clock
+        self.shard_capacity = max(1, max_keys // shards)
+        self._shards = [(threading.Lock(), OrderedDict()) for _ in range(shards)]
+        self._stats_lock = threading.Lock()
+        self.allowed = 0
+        self.rejected = 0
+        self.evicted = 0
+
+    def allow(self, key, rate, burst):
+        """
+        消耗一个令牌，返回 (是否放行, 建议重试等待秒数)
+        rate 为每秒补充的令牌数，burst 为桶容量
+        """
+        lock, buckets = self._shards[hash(key) % len(self._shards)]
+        now = self.clock()
+        evicted = 0
+        with lock:
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = TokenBucket(burst, now)
+                while len(buckets) > self.shard_capacity:
+                    buckets.popitem(last=False)
+                    evicted += 1
+            else:
+                buckets.move_to_end(key)
+                bucket.tokens = min(burst, bucket.tokens + (now - bucket.updated) * rate)
+                bucket.updated = now
+
+            if bucket.tokens >= 1:
+                bucket.tokens -= 1
+                allowed, retry_after = True, 0
+            else:
+                allowed, retry_after = False, (1 - bucket.tokens) / rate
+
+        with self._stats_lock:
+            self.evicted += evicted
+            if allowed:
+                self.allowed += 1
+            else:
+                self.rejected += 1
+        return allowed, retry_after
+
+    def reset(self):
+        """清空所有桶和计数"""
+        for lock, buckets in self._shards:
+            with lock:
+                buckets.clear()
+        with self._stats_lock:
+            self.allowed = self.rejected = self.evicted = 0
+
+    def stats(self):
+        with self._stats_lock:
+            stats = {
+                'allowed': self.allowed,
+                'rejected': self.rejected,
+                'evicted': self.evicted,
+            }
+        stats['tracked_keys'] = sum(len(buckets) for _, buckets in self._shards)
+        return stats
+
+
+class ConcurrencyLimiter:
+    """全局并发限制：超出上限的请求最多排队 queue_timeout 秒，队列满则立即拒绝"""
+
+    def __init__(self, max_concurrent=64, max_queue=128, queue_timeout=0.05):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._cond = threading.Condition()
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    def configure(self, max_concurrent, max_queue, queue_timeout=None):
+        """调整并发上限和排队长度，已在处理的请求不受影响"""
+        with self._cond:
+            self.max_concurrent = max_concurrent
+            self.max_queue = max_queue
+            if queue_timeout is not None:
+                self.queue_timeout = queue_timeout
+            self._cond.notify_all()
+
+    def acquire(self):
+        """申请一个并发名额，成功返回 True，调用方必须在结束时 release()"""
+        with self._cond:
+            if self.active < self.max_concurrent:
+                self.active += 1
+                self.admitted += 1
+                return True
+
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                return False
+
+            self.waiting += 1
+            self.queued += 1
+            try:
+                ok = self._cond.wait_for(
+                    lambda: self.active < self.max_concurrent, self.queue_timeout
+                )
+            finally:
+                self.waiting -= 1
+
+            if not ok:
+                self.timed_out += 1
+                return False
+            self.active += 1
+            self.admitted += 1
+            return True
+
+    def release(self):
+        with self._cond:
+            self.active -= 1
+            self._cond.notify()
+
+    def reset(self):
+        """清空计数（不影响正在处理的请求）"""
+        with self._cond:
+            self.admitted = self.queued = self.rejected = self.timed_out = 0
+
+    def stats(self):
+        with self._cond:
+            return {
+                'max_concurrent': self.max_concurrent,
+                'max_queue': self.max_queue,
+                'active': self.active,
+                'waiting': self.waiting,
+                'admitted': self.admitted,
+                'queued': self.queued,
+                'rejected': self.rejected,
+                'timed_out': self.timed_out,
+            }
@@ -0,0 +1,165 @@
+"""
+生产环境启动入口
+
+使用 gunicorn 以多进程（pre-fork）+ 多线程方式运行 backend.app：
+- 在 master 进程中导入应用并完成预热（preload），fork 后 worker 以写时复制方式共享内存
+- kill -HUP <master_pid> 平滑重启所有 worker，kill -TERM 优雅退出
+- /healthz 存活探针，/readyz 就绪探针（预热完成前返回503）
+
+用法:
+    python server.py --bind 0.0.0.0:8000 --workers 1 --threads 8
+    python server.py --config server.conf.py
+
+所有参数也可以通过环境变量设置，例如 SERVER_WORKERS=4、SERVER_THREADS=8。
+
+部署在 nginx 等反向代理之后时（默认只监听 127.0.0.1 即为此场景），需要用
+--trusted-proxies 指定代理层数，应用才会按 X-Forwarded-For 识别客户端IP，
+否则所有匿名用户共用代理IP的限流桶。不要设置得比实际代理层数多，
+否则客户端可以伪造 X-Forwarded-For 绕过限流。例如单层 nginx:
+    python server.py --trusted-proxies 1
+
+注意：数据存储在进程内存中，每个 worker 各有一份。workers > 1 时
+不同 worker 之间的写入互不可见，仅适合只读为主的部署。
+"""
+import argparse
+import multiprocessing
+import os
+import runpy
+import sys
+
+# 默认配置，可被配置文件、环境变量、命令行参数依次覆盖
+DEFAULT_CONFIG = {
+    'bind': '127.0.0.1:8000',
+    'workers': 1,
+    'threads': max(4, multiprocessing.cpu_count() * 2),
+    'timeout': 30,
+    'graceful_timeout': 30,
+    'keepalive': 5,
+    'backlog': 2048,
+    'max_requests': 0,
+    'max_requests_jitter': 0,
+    'loglevel': 'info',
+    'trusted_proxies': 0,
+    'sample_data': False,
+}
+
+# 只由应用使用、不传给 gunicorn 的配置项
+APP_ONLY_KEYS = {'trusted_proxies', 'sample_data'}
+
+ENV_PREFIX = 'SERVER_'
+
+
+def parse_bool(value):
+    """解析布尔型环境变量"""
+    return str(value).strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def load_config_file(path):
+    """读取Python格式的配置文件，只取 DEFAULT_CONFIG 中已知的键"""
+    values = runpy.run_path(path)
+    return {key: values[key] for key in DEFAULT_CONFIG if key in values}
+
+
+def load_env_config(environ=None):
+    """从 SERVER_* 环境变量读取配置"""
+    environ = os.environ if environ is None else environ
+    config = {}
+    for key, default in DEFAULT_CONFIG.items():
+        value = environ.get(ENV_PREFIX + key.upper())
+        if value is None:
+            continue
+        if isinstance(default, bool):
+            config[key] = parse_bool(value)
+        elif isinstance(default, int):
+            config[key] = int(value)
+        else:
+            config[key] = value
+    return config
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='校园活动社交App后端生产服务')
+    parser.add_argument('-c', '--config', help='Python格式的配置文件')
+    parser.add_argument('-b', '--bind', help='监听地址，默认 127.0.0.1:8000')
+    parser.add_argument('-w', '--workers', type=int, help='worker进程数，默认1')
+    parser.add_argument('-t', '--threads', type=int, help='每个worker的线程数')
+    parser.add_argument('--timeout', type=int, help='worker无响应超时（秒）')
+    parser.add_argument('--graceful-timeout', type=int, help='平滑重启/退出的等待时间（秒）')
+    parser.add_argument('--keepalive', type=int, help='keep-alive连接保持时间（秒）')
+    parser.add_argument('--backlog', type=int, help='监听队列长度')
+    parser.add_argument('--max-requests', type=int, help='worker处理多少请求后自动重启，0为不限')
+    parser.add_argument('--max-requests-jitter', type=int, help='max-requests的随机抖动')
+    parser.add_argument('--loglevel', help='日志级别')
+    parser.add_argument('--trusted-proxies', type=int,
+                        help='前面可信反向代理的层数，用于从X-Forwarded-For取客户端IP，默认0')
+    parser.add_argument('--sample-data', action='store_true', default=None,
+                        help='启动时写入样例数据')
+    return parser
+
+
+def resolve_config(argv=None, environ=None):
+    """合并配置：默认值 < 配置文件 < 环境变量 < 命令行参数"""
+    args = build_parser().parse_args(argv)
+    config = dict(DEFAULT_CONFIG)
+    if args.config:
+        config.update(load_config_file(args.config))
+    config.update(load_env_config(environ))
+    config.update({
+        key: value for key, value in vars(args).items()
+        if key in DEFAULT_CONFIG and value is not None
+    })
+    return config
+
+
+def create_app(config):
+    """导入并预热应用，在 fork 之前于 master 进程中执行"""
+    import backend
+
+    secret_key = os.environ.get('SECRET_KEY')
+    if secret_key:
+        backend.app.config['SECRET_KEY'] = secret_key
+    backend.apply_proxy_fix(config['trusted_proxies'])
+    backend.configure_concurrency(config['threads'])
+    if config['sample_data']:
+        backend.init_sample_data()
+
+    backend.warmup()
+    return backend.app
+
+
+def run(config):
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        sys.exit('生产模式需要 gunicorn，请先执行: pip install gunicorn')
+
+    class ProductionServer(BaseApplication):
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return self.application
+
+    def worker_exit(server, worker):
+        # 退出前执行完后台队列中的任务
+        import backend
+        backend.task_queue.shutdown(timeout=config['graceful_timeout'])
+
+    application = create_app(config)
+    options = {key: value for key, value in config.items() if key not in APP_ONLY_KEYS}
+    options.update({
+        'preload_app': True,
+        'worker_class': 'gthread',
+        'worker_exit': worker_exit,
+    })
+    ProductionServer(application, options).run()
+
+
+if __name__ == '__main__':
+    run(resolve_config())
@@ -0,0 +1,145 @@
+"""
+按字段分区的活动存储
+
+PartitionedEventStore 对外表现为 {event_id: event} 字典，内部按分区字段
+（默认 category）拆成多个分片，每个分片有自己的锁和按开始时间排序的索引：
+- 不同分区的写入互不阻塞
+- 按分区筛选只访问一个分片
+- 全量查询对各分片的有序索引做 k 路归并，无需整体排序
+
+写入只把 (start_time, event_id) 追加到待合并列表（O(1)），不在锁内复制索引；
+下一次查询时再把待合并条目排序后与原索引归并，并剔除已删除或已替换的旧条目，
+O(n + k log k) 的代价由该批 k 次写入分摊。代价是写入后的第一次查询会稍慢。
+
+活动写入后不应原地修改 start_time 或分区字段，需要修改时重新赋值 store[event_id]。
+"""
+import heapq
+import threading
+from collections.abc import MutableMapping
+
+
+class EventShard:
+    """单个分片：活动数据、写锁，以及按 (start_time, event_id) 排序的只读索引"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.events = {}
+        # 合并时整体替换，读取方无需加锁即可拿到一致的快照
+        self.index = ()
+        # 尚未并入索引的写入
+        self._pending = []
+        self._dirty = False
+
+    def put(self, event_id, event):
+        with self.lock:
+            self.events[event_id] = event
+            self._pending.append((event['start_time'], event_id))
+            self._dirty = True
+
+    def remove(self, event_id):
+        with self.lock:
+            self.events.pop(event_id)
+            self._dirty = True
+
+    def _is_current(self, entry):
+        event = self.events.get(entry[1])
+        return event is not None and event['start_time'] == entry[0]
+
+    def refresh_index(self):
+        """把待合并的写入并入有序索引，返回最新的索引快照"""
+        if not self._dirty:
+            return self.index
+        with self.lock:
+            if self._dirty:
+                self._pending.sort()
+                merged = []
+                for entry in heapq.merge(self.index, self._pending):
+                    # 同一条目可能同时出现在旧索引和待合并列表中
+                    if (not merged or merged[-1] != entry) and self._is_current(entry):
+                        merged.append(entry)
+                self.index = tuple(merged)
+                self._pending = []
+                self._dirty = False
+            return self.index
+
+    def scan(self, reverse=False):
+        """按索引快照顺序返回 (start_time, event_id, event)"""
+        events = self.events
+        index = self.refresh_index()
+        for start_time, event_id in (reversed(index) if reverse else index):
+            event = events.get(event_id)
+            if event is not None:  # 快照之后已被删除
+                yield start_time, event_id, event
+
+
+class PartitionedEventStore(MutableMapping):
+    """按 partition_field 分片的活动存储"""
+
+    def __init__(self, partition_field='category'):
+        self.partition_field = partition_field
+        self._shards = {}
+        # {event_id: 分区值}，用于按ID定位分片，保持插入顺序
+        self._locate = {}
+        self._lock = threading.Lock()
+
+    def partition_of(self, event):
+        return event.get(self.partition_field) or ''
+
+    def _shard(self, partition, create=False):
+        shard = self._shards.get(partition)
+        if shard is None and create:
+            with self._lock:
+                shard = self._shards.setdefault(partition, EventShard())
+        return shard
+
+    def __getitem__(self, event_id):
+        return self._shards[self._locate[event_id]].events[event_id]
+
+    def __setitem__(self, event_id, event):
+        partition = self.partition_of(event)
+        old_partition = self._locate.get(event_id)
+        if old_partition is not None and old_partition != partition:
+            self._shards[old_partition].remove(event_id)
+        self._shard(partition, create=True).put(event_id, event)
+        self._locate[event_id] = partition
+
+    def __delitem__(self, event_id):
+        partition = self._locate.pop(event_id)
+        self._shards[partition].remove(event_id)
+
+    def __contains__(self, event_id):
+        return event_id in self._locate
+
+    def __iter__(self):
+        return iter(list(self._locate))
+
+    def __len__(self):
+        return len(self._locate)
+
+    def clear(self):
+        with self._lock:
+            self._shards = {}
+            self._locate = {}
+
+    def lock_for(self, event_id):
+        """活动所在分片的锁，用于保护与该活动相关的读改写"""
+        return self._shards[self._locate[event_id]].lock
+
+    def partitions(self):
+        """各分区的活动数量"""
+        return {partition: len(shard.events) for partition, shard in list(self._shards.items())}
+
+    def query(self, partition=None, reverse=False):
+        """
+        按开始时间顺序返回 (event_id, event)
+        指定 partition 时只访问该分片，否则对所有分片的有序索引做 k 路归并
+        """
+        if partition is not None:
+            shard = self._shard(partition)
+            shards = [shard] if shard is not None else []
+        else:
+            shards = list(self._shards.values())
+
+        runs = [shard.scan(reverse) for shard in shards]
+        for _, event_id, event in heapq.merge(*runs, key=lambda item: item[:2], reverse=reverse):
+            yield event_id, event
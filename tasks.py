@@ -0,0 +1,181 @@
+"""
+进程内后台任务队列
+
+把非关键的副作用（变更流、通知等）移出请求线程：
+- 有界队列 + 若干工作线程，工作线程每次取出一批任务连续执行
+- submit_batched() 提交的条目按处理函数合并，同一批内只调用一次处理函数
+- 队列满时短暂等待，仍然满则在调用线程直接执行（背压，不丢任务）
+- drain() 等待已提交任务执行完，shutdown() 停止工作线程前先排空队列
+- 工作线程在首次提交时启动，并在 fork 后的子进程中重新启动
+"""
+import logging
+import os
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+# 通知工作线程退出的哨兵
+_STOP = object()
+
+
+class TaskQueue:
+    """有界后台任务队列"""
+
+    def __init__(self, workers=2, max_size=10000, batch_size=64, put_timeout=0.01):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.put_timeout = put_timeout
+        self._queue = queue.Queue(max_size)
+        self._threads = []
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._closed = False
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.inline = 0
+        self.batches = 0
+
+    def _ensure_started(self):
+        if self._pid == os.getpid() or self._closed:
+            return
+        with self._lock:
+            if self._pid == os.getpid() or self._closed:
+                return
+            self._threads = [
+                threading.Thread(target=self._worker, name=f'task-worker-{i}', daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+            self._pid = os.getpid()
+
+    def _enqueue(self, task):
+        """
+        在锁内检查关闭状态并入队，保证 shutdown() 之后不会有任务排到退出哨兵后面
+        返回 True 已入队，False 队列已满，None 队列已关闭
+        """
+        with self._lock:
+            if self._closed:
+                return None
+            try:
+                self._queue.put_nowait(task)
+                return True
+            except queue.Full:
+                return False
+
+    def submit(self, fn, *args, **kwargs):
+        """提交任务，返回 True 表示进入队列，False 表示因背压或已关闭在当前线程执行"""
+        return self._submit((fn, args, kwargs, False))
+
+    def submit_batched(self, handler, item):
+        """
+        提交一个批处理条目：工作线程把同一批取出的条目合并为列表，
+        调用一次 handler(items)；在当前线程执行时为 handler([item])
+        """
+        return self._submit((handler, (item,), {}, True))
+
+    def _submit(self, task):
+        self._ensure_started()
+        queued = self._enqueue(task)
+        if queued is False and self.put_timeout:
+            # 队列满时在锁外短暂等待空位，再试一次
+            with self._queue.not_full:
+                self._queue.not_full.wait(self.put_timeout)
+            queued = self._enqueue(task)
+
+        if queued:
+            with self._stats_lock:
+                self.submitted += 1
+            return True
+        if queued is False:
+            with self._stats_lock:
+                self.submitted += 1
+                self.inline += 1
+        self._execute([task])
+        return False
+
+    def _run(self, fn, args, kwargs, count=1):
+        try:
+            fn(*args, **kwargs)
+        except Exception:
+            logger.exception('后台任务执行失败: %r', fn)
+            with self._stats_lock:
+                self.failed += count
+        else:
+            with self._stats_lock:
+                self.completed += count
+
+    def _execute(self, tasks):
+        """执行一批任务，批处理条目按处理函数合并后各调用一次"""
+        batched = {}
+        for fn, args, kwargs, is_batched in tasks:
+            if is_batched:
+                batched.setdefault(fn, []).append(args[0])
+            else:
+                self._run(fn, args, kwargs)
+        for handler, items in batched.items():
+            self._run(handler, (items,), {}, count=len(items))
+
+    def _worker(self):
+        stop = False
+        while not stop:
+            # 取一批任务，遇到哨兵就不再继续取，保证每个线程只消费一个哨兵
+            batch = [self._queue.get()]
+            while batch[-1] is not _STOP and len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            with self._stats_lock:
+                self.batches += 1
+            stop = batch[-1] is _STOP
+            self._execute(batch[:-1] if stop else batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    def drain(self, timeout=None):
+        """等待队列中的任务全部执行完，超时返回 False"""
+        with self._queue.all_tasks_done:
+            return self._queue.all_tasks_done.wait_for(
+                lambda: self._queue.unfinished_tasks == 0, timeout
+            )
+
+    def shutdown(self, timeout=5):
+        """排空队列后停止工作线程，之后提交的任务在调用线程执行"""
+        with self._lock:
+            self._closed = True
+            started = self._pid == os.getpid()
+        if started:
+            for _ in self._threads:
+                self._queue.put(_STOP)
+            for thread in self._threads:
+                thread.join(timeout)
+            self._threads = []
+            self._pid = None
+
+        # 工作线程超时未退出时，剩下的任务在当前线程执行完
+        while True:
+            try:
+                task = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if task is not _STOP:
+                self._execute([task])
+            self._queue.task_done()
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                'workers': len(self._threads),
+                'queued': self._queue.qsize(),
+                'max_size': self._queue.maxsize,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'inline': self.inline,
+                'batches': self.batches,
+            }
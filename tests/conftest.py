@@ -6,13 +6,14 @@ import pytest
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.insert(0, BASE_DIR)
 
-from backend import app, init_sample_data
+from backend import app, init_sample_data, rate_limiter
 
 
 @pytest.fixture
 def client():
     app.config['TESTING'] = True
     app.config['SECRET_KEY'] = 'test-key'
+    rate_limiter.reset()
 
     with app.test_client() as client:
         with app.app_context():
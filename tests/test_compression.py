@@ -0,0 +1,66 @@
+import gzip
+import json
+
+from backend import compression_cache, static_assets
+
+
+def login(client):
+    client.post('/api/login', json={
+        'username': 'alice',
+        'password': '123456'
+    })
+
+
+def test_large_response_gzipped(client):
+    login(client)
+    client.post('/api/events', json={
+        'title': '长描述活动',
+        'start_time': '2099-01-01 10:00',
+        'end_time': '2099-01-01 12:00',
+        'location': '图书馆',
+        'description': '活动介绍' * 500
+    })
+
+    resp = client.get('/api/events', headers={'Accept-Encoding': 'gzip'})
+    assert resp.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in resp.headers['Vary']
+    data = json.loads(gzip.decompress(resp.get_data()))
+    assert data['code'] == 0
+
+    hits = compression_cache.stats()['hits']
+    client.get('/api/events', headers={'Accept-Encoding': 'gzip'})
+    assert compression_cache.stats()['hits'] == hits + 1
+
+
+def test_small_response_not_gzipped(client):
+    resp = client.get('/api/categories', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in resp.headers
+    assert resp.json['code'] == 0
+
+
+def test_static_asset_precompressed(client):
+    asset = static_assets['style.css']
+    resp = client.get(f'/style.css?v={asset.etag}', headers={'Accept-Encoding': 'gzip'})
+    assert resp.status_code == 200
+    assert resp.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(resp.get_data()) == asset.body
+    assert 'immutable' in resp.headers['Cache-Control']
+
+    resp = client.get('/style.css', headers={'If-None-Match': f'"{asset.etag}"'})
+    assert resp.status_code == 304
+
+
+def test_html_references_fingerprinted(client):
+    resp = client.get('/index.html')
+    assert resp.headers['Cache-Control'] == 'no-cache'
+    assert f'app.js?v={static_assets["app.js"].etag}' in resp.get_data(as_text=True)
+
+
+def test_unknown_static_asset(client):
+    assert client.get('/missing.html').status_code == 404
+
+
+def test_unrelated_paths_keep_default_behaviour(client):
+    assert client.get('/nope').status_code == 404
+    assert client.post('/api/nope').status_code == 404
+    assert client.post('/index.html').status_code == 405
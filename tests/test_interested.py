@@ -0,0 +1,73 @@
+def login(client, username='alice'):
+    client.post('/api/login', json={
+        'username': username,
+        'password': '123456'
+    })
+
+
+def register_and_join(client, event_id, count, prefix='page_user'):
+    user_ids = []
+    for i in range(count):
+        username = f'{prefix}_{event_id}_{i}'
+        resp = client.post('/api/register', json={
+            'username': username,
+            'password': '123456'
+        })
+        user_ids.append(resp.json['data']['user_id'])
+        login(client, username)
+        client.post(f'/api/events/{event_id}/interest')
+    return user_ids
+
+
+def test_interested_first_page(client):
+    resp = client.get('/api/events/3/interested')
+    data = resp.json['data']
+    assert [u['username'] for u in data['users']] == ['alice', 'bob']
+    assert data['total'] == 2
+    assert data['has_more'] is False
+    assert data['next_cursor'] is None
+
+
+def test_interested_keyset_pages(client):
+    user_ids = register_and_join(client, 3, 5)
+    expected = [1, 2] + user_ids
+
+    seen = []
+    url = '/api/events/3/interested?limit=3'
+    while True:
+        data = client.get(url).json['data']
+        seen.extend(u['user_id'] for u in data['users'])
+        if not data['has_more']:
+            break
+        url = f'/api/events/3/interested?limit=3&after={data["next_cursor"]}'
+    assert seen == expected
+
+
+def test_interested_cursor_survives_cancel(client):
+    # bob 取消后，以 bob 为游标仍能继续翻页
+    login(client, 'bob')
+    client.post('/api/events/3/interest')
+    resp = client.get('/api/events/3/interested?after=2')
+    assert resp.status_code == 200
+    assert all(u['user_id'] != 2 for u in resp.json['data']['users'])
+
+
+def test_interested_invalid_params(client):
+    assert client.get('/api/events/999/interested').status_code == 404
+    assert client.get('/api/events/3/interested?limit=abc').json['code'] == -1
+    assert client.get('/api/events/2/interested?after=1').json['message'] == '无效的分页游标'
+
+
+def test_interested_cursor_stable_after_rejoin(client):
+    user_ids = register_and_join(client, 3, 4, prefix='rejoin_user')
+
+    first = client.get('/api/events/3/interested?limit=2').json['data']
+    assert [u['user_id'] for u in first['users']] == [1, 2]
+
+    # bob 在两次翻页之间取消后重新加入，排到队尾
+    login(client, 'bob')
+    client.post('/api/events/3/interest')
+    client.post('/api/events/3/interest')
+
+    resp = client.get(f'/api/events/3/interested?limit=10&after={first["next_cursor"]}')
+    assert [u['user_id'] for u in resp.json['data']['users']] == user_ids + [2]
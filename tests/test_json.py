@@ -0,0 +1,81 @@
+import json
+from datetime import datetime
+
+from flask.json.provider import DefaultJSONProvider
+
+import json_provider
+from backend import app
+from json_provider import FastJSONProvider, RawList
+
+
+PAYLOAD = {
+    'title': '人工智能讲座',
+    'created_at': datetime(2030, 1, 1, 8, 30),
+    'counts': {2: 1, 1: 3},
+    'tags': ['a', None, True, 1.5],
+}
+
+
+def stdlib_dumps(obj):
+    provider = DefaultJSONProvider(app)
+    provider.ensure_ascii = False
+    return provider.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def test_provider_matches_stdlib_output():
+    assert FastJSONProvider(app).dumps_bytes(PAYLOAD) == stdlib_dumps(PAYLOAD)
+
+
+def test_provider_fallback_without_orjson(monkeypatch):
+    monkeypatch.setattr(json_provider, 'orjson', None)
+    provider = FastJSONProvider(app)
+    assert provider.dumps_bytes(PAYLOAD) == stdlib_dumps(PAYLOAD)
+    assert provider.loads('{"a": 1}') == {'a': 1}
+    assert provider.dumps_with_raw({'x': RawList([b'1', b'2'])}) == b'{"x":[1,2]}'
+
+
+def test_raw_list_spliced():
+    provider = FastJSONProvider(app)
+    obj = {'data': {'events': RawList([b'{"id":1}', b'{"id":2}']), 'total': 2}}
+    encoded = provider.dumps_with_raw(obj)
+    assert json.loads(encoded) == {'data': {'events': [{'id': 1}, {'id': 2}], 'total': 2}}
+
+
+def test_events_list_non_ascii(client):
+    resp = client.get('/api/events?status=all')
+    assert '人工智能前沿讲座'.encode('utf-8') in resp.get_data()
+
+
+def test_event_fragment_refreshed_after_toggle(client):
+    client.post('/api/login', json={'username': 'alice', 'password': '123456'})
+
+    def event_2():
+        events = client.get('/api/events').json['data']['events']
+        return next(e for e in events if e['id'] == 2)
+
+    before = event_2()
+    client.post('/api/events/2/interest')
+    after = event_2()
+    assert after['is_interested'] is True
+    assert after['interested_count'] == before['interested_count'] + 1
+
+    detail = client.get('/api/events/2').json['data']
+    assert {k: after[k] for k in after} == {k: detail[k] for k in after}
+
+
+def test_provider_falls_back_on_big_int():
+    obj = {'capacity': 10 ** 20}
+    assert FastJSONProvider(app).dumps_bytes(obj) == b'{"capacity":100000000000000000000}'
+
+
+def test_capacity_upper_bound(client):
+    client.post('/api/login', json={'username': 'alice', 'password': '123456'})
+    resp = client.post('/api/events', json={
+        'title': '超大活动',
+        'start_time': '2099-06-01 10:00',
+        'end_time': '2099-06-01 12:00',
+        'location': '操场',
+        'capacity': '100000000000000000000'
+    })
+    assert resp.json['code'] == -1
+    assert client.get('/api/events').status_code == 200
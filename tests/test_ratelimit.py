@@ -0,0 +1,95 @@
+import threading
+
+from backend import app, apply_proxy_fix, concurrency_limiter
+from ratelimit import RateLimiter, ConcurrencyLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_refill():
+    clock = FakeClock()
+    limiter = RateLimiter(shards=2, clock=clock)
+    assert [limiter.allow('k', 1, 2)[0] for _ in range(3)] == [True, True, False]
+
+    clock.now = 1.0
+    assert limiter.allow('k', 1, 2)[0] is True
+    allowed, retry_after = limiter.allow('k', 1, 2)
+    assert allowed is False and retry_after == 1
+    assert limiter.stats()['rejected'] == 2
+
+
+def test_limiter_lru_eviction():
+    limiter = RateLimiter(shards=1, max_keys=3)
+    for i in range(5):
+        limiter.allow(i, 1, 1)
+    stats = limiter.stats()
+    assert stats['tracked_keys'] == 3
+    assert stats['evicted'] == 2
+
+
+def test_concurrency_limiter_rejects_when_queue_full():
+    limiter = ConcurrencyLimiter(max_concurrent=1, max_queue=0)
+    assert limiter.acquire() is True
+    assert limiter.acquire() is False
+    limiter.release()
+    assert limiter.acquire() is True
+    assert limiter.stats()['rejected'] == 1
+
+
+def test_concurrency_limiter_queue_admits_after_release():
+    limiter = ConcurrencyLimiter(max_concurrent=1, max_queue=1, queue_timeout=1)
+    limiter.acquire()
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(limiter.acquire()))
+    waiter.start()
+    limiter.release()
+    waiter.join()
+    assert results == [True]
+    assert limiter.stats()['timed_out'] == 0
+
+
+def test_route_rate_limit(client):
+    limits = app.config['RATE_LIMITS']
+    app.config['RATE_LIMITS'] = dict(limits, get_categories=(0.01, 2))
+    try:
+        responses = [client.get('/api/categories') for _ in range(3)]
+    finally:
+        app.config['RATE_LIMITS'] = limits
+    assert [r.status_code for r in responses] == [200, 200, 429]
+    assert int(responses[-1].headers['Retry-After']) >= 1
+
+    stats = client.get('/api/stats/limits').json['data']
+    assert stats['rate_limit']['rejected'] == 1
+    assert stats['concurrency']['active'] == 0
+
+
+def test_forwarded_clients_limited_separately(client):
+    limits = app.config['RATE_LIMITS']
+    app.config['RATE_LIMITS'] = dict(limits, get_categories=(0.01, 1))
+    apply_proxy_fix(1)
+    try:
+        codes = [
+            client.get('/api/categories', headers={'X-Forwarded-For': ip}).status_code
+            for ip in ('10.0.0.1', '10.0.0.2', '10.0.0.1')
+        ]
+    finally:
+        apply_proxy_fix(0)
+        app.config['RATE_LIMITS'] = limits
+    assert codes == [200, 200, 429]
+
+
+def test_concurrency_rejection_has_retry_after(client):
+    saved = concurrency_limiter.max_concurrent, concurrency_limiter.max_queue
+    concurrency_limiter.max_concurrent, concurrency_limiter.max_queue = 0, 0
+    try:
+        resp = client.get('/api/categories')
+    finally:
+        concurrency_limiter.max_concurrent, concurrency_limiter.max_queue = saved
+    assert resp.status_code == 503
+    assert resp.headers['Retry-After'] == '1'
@@ -0,0 +1,77 @@
+from backend import (
+    app, app_ready, concurrency_limiter, event_fragments, events_db, rate_limiter, warmup
+)
+from server import DEFAULT_CONFIG, create_app, resolve_config
+
+
+def test_healthz(client):
+    resp = client.get('/healthz')
+    assert resp.status_code == 200
+    assert resp.json['data']['status'] == 'ok'
+
+
+def test_readyz_after_warmup(client):
+    app_ready.clear()
+    assert client.get('/readyz').status_code == 503
+
+    warmup()
+    resp = client.get('/readyz')
+    assert resp.status_code == 200
+    assert resp.json['data']['status'] == 'ready'
+
+
+def test_resolve_config_precedence(tmp_path):
+    conf = tmp_path / 'server.conf.py'
+    conf.write_text("workers = 2\nthreads = 3\nbind = '0.0.0.0:9000'\n")
+
+    config = resolve_config(
+        ['-c', str(conf), '--threads', '16'],
+        environ={'SERVER_WORKERS': '4', 'SERVER_SAMPLE_DATA': 'true'}
+    )
+    assert config['bind'] == '0.0.0.0:9000'
+    assert config['workers'] == 4
+    assert config['threads'] == 16
+    assert config['sample_data'] is True
+    assert config['timeout'] == DEFAULT_CONFIG['timeout']
+
+
+def test_warmup_keeps_interest_cursors(client):
+    # bob 取消想去后，以 bob 为游标的分页在预热后仍然有效
+    client.post('/api/login', json={'username': 'bob', 'password': '123456'})
+    client.post('/api/events/3/interest')
+
+    warmup()
+    resp = client.get('/api/events/3/interested?after=2')
+    assert resp.status_code == 200
+    assert resp.json['code'] == 0
+
+
+def test_warmup_primes_fragments_without_spending_tokens(client):
+    event_fragments.clear()
+    before = rate_limiter.stats()
+
+    warmup()
+    assert set(event_fragments) == set(events_db)
+    after = rate_limiter.stats()
+    assert after['allowed'] == before['allowed']
+    assert after['rejected'] == before['rejected']
+
+
+def test_create_app_limits_concurrency_below_threads():
+    saved = (concurrency_limiter.max_concurrent, concurrency_limiter.max_queue,
+             app.config['MAX_CONCURRENT_REQUESTS'], app.config['MAX_QUEUED_REQUESTS'])
+    config = dict(DEFAULT_CONFIG, threads=4)
+    flask_app = create_app(config)
+    assert concurrency_limiter.max_concurrent == 3
+    assert concurrency_limiter.max_queue == 1
+
+    held = [concurrency_limiter.acquire() for _ in range(3)]
+    try:
+        resp = flask_app.test_client().get('/api/categories')
+    finally:
+        for _ in held:
+            concurrency_limiter.release()
+        concurrency_limiter.configure(saved[0], saved[1])
+        app.config['MAX_CONCURRENT_REQUESTS'], app.config['MAX_QUEUED_REQUESTS'] = saved[2:]
+    assert all(held)
+    assert resp.status_code == 503
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+
+from store import PartitionedEventStore
+
+
+BASE = datetime(2030, 1, 1)
+
+
+def make_event(category, hours):
+    return {'category': category, 'start_time': BASE + timedelta(hours=hours)}
+
+
+def test_query_merges_partitions_in_start_order():
+    store = PartitionedEventStore()
+    store[1] = make_event('学术讲座', 5)
+    store[2] = make_event('文体娱乐', 1)
+    store[3] = make_event('学术讲座', 3)
+    store[4] = make_event('', 2)
+
+    assert [eid for eid, _ in store.query()] == [2, 4, 3, 1]
+    assert [eid for eid, _ in store.query(reverse=True)] == [1, 3, 4, 2]
+    assert [eid for eid, _ in store.query('学术讲座')] == [3, 1]
+    assert list(store.query('社团招新')) == []
+    assert store.partitions() == {'学术讲座': 2, '文体娱乐': 1, '': 1}
+
+
+def test_reassign_moves_between_partitions():
+    store = PartitionedEventStore()
+    store[1] = make_event('学术讲座', 1)
+    store[1] = make_event('其他', 2)
+
+    assert len(store) == 1
+    assert store[1]['category'] == '其他'
+    assert list(store.query('学术讲座')) == []
+    assert [eid for eid, _ in store.query('其他')] == [1]
+
+    del store[1]
+    assert 1 not in store
+    assert list(store.query()) == []
+
+
+def test_category_filter_returns_sorted(client):
+    client.post('/api/login', json={'username': 'alice', 'password': '123456'})
+    for day in (9, 7, 8):
+        client.post('/api/events', json={
+            'title': f'讲座{day}',
+            'start_time': f'2099-03-0{day} 10:00',
+            'end_time': f'2099-03-0{day} 12:00',
+            'location': '报告厅',
+            'category': '学术讲座'
+        })
+
+    events = client.get('/api/events?category=学术讲座').json['data']['events']
+    assert {e['category'] for e in events} == {'学术讲座'}
+    starts = [e['start_time'] for e in events]
+    assert starts == sorted(starts)
+
+
+def test_index_merges_pending_writes():
+    store = PartitionedEventStore()
+    store[1] = make_event('其他', 3)
+    assert [eid for eid, _ in store.query()] == [1]
+
+    # 已合并的条目被替换、重复写入和删除都不应留下旧条目
+    store[1] = make_event('其他', 1)
+    store[2] = make_event('其他', 2)
+    store[2] = make_event('其他', 2)
+    store[3] = make_event('其他', 0)
+    del store[3]
+    assert [eid for eid, _ in store.query()] == [1, 2]
+    assert store._shard('其他').index == (
+        (BASE + timedelta(hours=1), 1), (BASE + timedelta(hours=2), 2)
+    )
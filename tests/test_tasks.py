@@ -0,0 +1,181 @@
+import threading
+
+from backend import apply_changes, change_feed, make_change, task_queue
+from tasks import TaskQueue
+
+
+def login(client, username='alice'):
+    client.post('/api/login', json={
+        'username': username,
+        'password': '123456'
+    })
+
+
+def test_queue_runs_and_drains():
+    tasks = TaskQueue(workers=2, batch_size=8)
+    done = []
+    for i in range(20):
+        assert tasks.submit(done.append, i) is True
+    assert tasks.drain(timeout=5)
+    assert sorted(done) == list(range(20))
+
+    stats = tasks.stats()
+    assert stats['completed'] == 20
+    assert stats['batches'] <= 20
+    tasks.shutdown()
+
+
+def test_queue_backpressure_runs_inline():
+    tasks = TaskQueue(workers=1, max_size=1, put_timeout=0)
+    started, gate = threading.Event(), threading.Event()
+
+    def block():
+        started.set()
+        gate.wait()
+
+    tasks.submit(block)          # 占住唯一的工作线程
+    started.wait(timeout=5)
+    tasks.submit(lambda: None)   # 填满队列
+
+    ran_in = []
+    assert tasks.submit(lambda: ran_in.append(threading.current_thread())) is False
+    assert ran_in == [threading.current_thread()]
+    assert tasks.stats()['inline'] == 1
+
+    gate.set()
+    tasks.shutdown()
+
+
+def test_shutdown_drains_pending_tasks():
+    tasks = TaskQueue(workers=1)
+    done = []
+
+    def fail():
+        raise RuntimeError('boom')
+
+    tasks.submit(fail)
+    for i in range(5):
+        tasks.submit(done.append, i)
+    tasks.shutdown()
+    assert done == list(range(5))
+    assert tasks.stats()['failed'] == 1
+
+    # 关闭后提交的任务直接执行
+    tasks.submit(done.append, 5)
+    assert done[-1] == 5
+
+
+def test_interest_recorded_in_change_feed(client):
+    login(client)
+    client.post('/api/events/2/interest')
+    task_queue.drain(timeout=5)
+
+    changes = client.get('/api/changes').json['data']['changes']
+    assert changes[-1]['type'] == 'interest_added'
+    assert changes[-1]['event_id'] == 2
+
+    last_seq = changes[-1]['seq']
+    data = client.get(f'/api/changes?after={last_seq}').json['data']
+    assert data['changes'] == []
+    assert data['last_seq'] == last_seq
+
+
+def test_creator_notified_when_event_full(client):
+    login(client)
+    event_id = client.post('/api/events', json={
+        'title': '小型研讨会',
+        'start_time': '2099-05-01 10:00',
+        'end_time': '2099-05-01 12:00',
+        'location': '会议室',
+        'capacity': 1
+    }).json['data']['id']
+
+    login(client, 'bob')
+    client.post(f'/api/events/{event_id}/interest')
+    task_queue.drain(timeout=5)
+
+    login(client)
+    notifications = client.get('/api/my/notifications').json['data']['notifications']
+    assert notifications[0]['type'] == 'event_full'
+    assert notifications[0]['event_id'] == event_id
+
+
+def test_change_feed_order_matches_writes(client):
+    login(client)
+    client.post('/api/events/2/interest')
+    client.post('/api/events/2/interest')
+    task_queue.drain(timeout=5)
+
+    changes = client.get('/api/changes').json['data']['changes']
+    assert [c['type'] for c in changes[-2:]] == ['interest_added', 'interest_removed']
+    assert changes[-2]['seq'] < changes[-1]['seq']
+
+
+def test_full_notification_sent_once(client):
+    login(client)
+    event_id = client.post('/api/events', json={
+        'title': '单人体验课',
+        'start_time': '2099-05-02 10:00',
+        'end_time': '2099-05-02 12:00',
+        'location': '琴房',
+        'capacity': 1
+    }).json['data']['id']
+
+    login(client, 'bob')
+    for _ in range(3):  # 加入、取消、再加入
+        client.post(f'/api/events/{event_id}/interest')
+    task_queue.drain(timeout=5)
+
+    login(client)
+    notifications = client.get('/api/my/notifications').json['data']['notifications']
+    assert [n['event_id'] for n in notifications].count(event_id) == 1
+
+
+def test_submit_after_shutdown_never_strands_tasks():
+    tasks = TaskQueue(workers=2)
+    done = []
+    submitters = [
+        threading.Thread(target=lambda n=n: [tasks.submit(done.append, (n, i)) for i in range(200)])
+        for n in range(4)
+    ]
+    for thread in submitters:
+        thread.start()
+    tasks.shutdown()
+    for thread in submitters:
+        thread.join()
+
+    assert len(done) == 800
+    assert tasks.drain(timeout=1)
+
+
+def test_changes_applied_in_seq_order_when_delivered_out_of_order():
+    task_queue.drain(timeout=5)
+    first = make_change('interest_added', 1, 1)
+    second = make_change('interest_removed', 1, 1)
+
+    apply_changes([second])
+    assert change_feed[-1]['seq'] != second['seq']  # 等待前一个序号
+
+    apply_changes([first])
+    assert [c['seq'] for c in list(change_feed)[-2:]] == [first['seq'], second['seq']]
+
+
+def test_batched_items_handled_in_one_call():
+    tasks = TaskQueue(workers=1, batch_size=16)
+    started, gate = threading.Event(), threading.Event()
+
+    def block():
+        started.set()
+        gate.wait()
+
+    calls = []
+    tasks.submit(block)
+    started.wait(timeout=5)
+    for i in range(5):
+        tasks.submit_batched(calls.append, i)
+    gate.set()
+    tasks.drain(timeout=5)
+    tasks.shutdown()
+
+    assert calls == [[0, 1, 2, 3, 4]]
+    assert tasks.stats()['completed'] == 6